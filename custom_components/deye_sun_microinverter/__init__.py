@@ -4,7 +4,9 @@ from __future__ import annotations
 import asyncio
 import logging
 import re
-from datetime import timedelta, datetime
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import lru_cache
 from typing import Any
 
 import aiohttp
@@ -25,12 +27,81 @@ from .const import (
     DEFAULT_SCAN_INTERVAL,
     WIFI_UPDATE_INTERVAL,
     DEVICE_INFO_UPDATE_INTERVAL,
+    MAX_BACKOFF_INTERVAL,
+    MAX_BACKOFF_EXPONENT,
+    CIRCUIT_BREAKER_THRESHOLD,
+    CIRCUIT_BREAKER_WINDOW,
+    MIN_REQUEST_TIMEOUT,
+    MAX_REQUEST_TIMEOUT,
+    MAX_NOT_MODIFIED_REPLIES,
+    KEY_AVAILABLE,
+    KEY_CURRENT_POWER,
+    KEY_TODAY_ENERGY,
+    KEY_TOTAL_ENERGY,
+    KEY_SERIAL_NUMBER,
+    KEY_FIRMWARE_VERSION,
+    KEY_MODULE_ID,
+    KEY_WIFI_SSID,
+    KEY_WIFI_SIGNAL,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+# Variables grouped by how often we need them
+_POWER_VARS = frozenset({"webdata_now_p", "webdata_today_e", "webdata_total_e"})
+_WIFI_VARS = frozenset({"cover_sta_ssid", "cover_sta_rssi"})
+_DEVICE_VARS = frozenset({"webdata_sn", "cover_ver", "cover_mid"})
+
+_STREAM_CHUNK_SIZE = 4096
+# Generous upper bound for one `var name = "value";` declaration, so a
+# declaration split across chunks is still found without rescanning the page
+_MAX_VAR_DECLARATION = 512
+
+
+@lru_cache(maxsize=None)
+def _vars_regex(names: frozenset[str]) -> re.Pattern[bytes]:
+    """Return a bytes regex matching only the given status.html variables."""
+    # One alternation, so the streaming reader extracts every variable in a
+    # single pass. Only a few name sets exist, each compiled once.
+    # Deliberately no HTML parser (BeautifulSoup, lxml, selectolax): the page
+    # is machine generated with a fixed `var name = "value";` layout, and a
+    # regex over the raw bytes beats building any DOM for a handful of lines.
+    # Keep it that way unless the page format actually changes.
+    alternation = "|".join(sorted(names))
+    return re.compile(
+        rf'var\s+(?P<k>{alternation})\s*=\s*"(?P<v>[^"]*)";'.encode()
+    )
+
+
+def _parse_float(text: str) -> float:
+    """Parse a numeric status.html value. Returns 0.0 for "---", empty or garbage."""
+    value = text.strip()
+    if not value or value == "---":
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+@dataclass(slots=True)
+class _InverterCache:
+    """Last known inverter values, used while the inverter is offline."""
+
+    # Energy values (preserved when offline)
+    current_power: float = 0.0
+    today_energy: float = 0.0
+    total_energy: float = 0.0
+    # Device info (only fetched once per day)
+    serial_number: str | None = None
+    firmware_version: str | None = None
+    module_id: str | None = None
+    # WiFi info (fetched every 15 minutes)
+    wifi_ssid: str | None = None
+    wifi_signal: str | None = None
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Deye SUN Inverter from a config entry."""
@@ -98,38 +169,53 @@ class DeyeDataUpdateCoordinator(DataUpdateCoordinator):
             "Initializing Deye coordinator for %s with %ds update interval",
             host, scan_interval
         )
+        # Remember the configured interval so backoff can be undone
+        self._base_interval = timedelta(seconds=scan_interval)
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=scan_interval),
+            update_interval=self._base_interval,
         )
         self.host = host
         self.username = username
         self.password = password
+        self._url = f"http://{host}/status.html"
         self._session = async_get_clientsession(hass)
+        # Credentials never change for the life of the coordinator (a reload
+        # after an options change builds a new one), so the Basic auth header
+        # is encoded once here instead of by aiohttp on every request
+        self._headers = {
+            aiohttp.hdrs.AUTHORIZATION: aiohttp.BasicAuth(username, password).encode(),
+        }
+        # Deye inverters are slow single-threaded devices. The total timeout
+        # follows a moving average of their response time (starting at 10s),
+        # so slow units get more time, but never more than one scan interval.
+        self._max_timeout = max(
+            MIN_REQUEST_TIMEOUT, min(MAX_REQUEST_TIMEOUT, scan_interval)
+        )
+        self._rtt_ewma = 2.5
+        self._timeout = self._timeout_for_rtt()
         
         # Track last update times for different data types
-        self._last_wifi_update: datetime | None = None
-        self._last_device_info_update: datetime | None = None
-        
-        # Cache for device info (only fetched once per day)
-        self._device_info_cache: dict[str, Any] = {}
+        # (monotonic event loop time, immune to wall-clock/DST jumps)
+        self._last_wifi_update: float | None = None
+        self._last_device_info_update: float | None = None
         
-        # Cache for wifi info (fetched every 15 minutes)
-        self._wifi_info_cache: dict[str, Any] = {}
+        # Cache for energy (preserved when offline), wifi and device info
+        self._cache = _InverterCache()
         
-        # Cache for energy values (preserved when offline)
-        self._energy_cache: dict[str, Any] = {
-            "today_energy": 0.0,
-            "total_energy": 0.0,
-            "current_power": 0.0,
-        }
+        # Conditional GET state; stays None if the inverter sends no Last-Modified
+        self._last_modified: str | None = None
+        self._last_good_data: dict | None = None
+        self._not_modified_count = 0
         
         # Track connection state
         self._is_available = False
         self._consecutive_failures = 0
         self._max_failures_before_unavailable = 3
+        # Monotonic time until which polls skip the network entirely
+        self._circuit_open_until = 0.0
         
         # Track last reset date for energy
         self._last_reset_date = dt_util.now().date()
@@ -138,18 +224,18 @@ class DeyeDataUpdateCoordinator(DataUpdateCoordinator):
         """Return data structure when inverter is unavailable (night mode)."""
         return {
             # Power data - 0 when offline (no production)
-            "current_power": 0.0,
+            KEY_CURRENT_POWER: 0.0,
             # Energy data - use cached values to preserve dashboard calculations
-            "today_energy": self._energy_cache.get("today_energy", 0.0),
-            "total_energy": self._energy_cache.get("total_energy", 0.0),
+            KEY_TODAY_ENERGY: self._cache.today_energy,
+            KEY_TOTAL_ENERGY: self._cache.total_energy,
             # Device info - use cached values
-            "serial_number": self._device_info_cache.get("serial_number"),
-            "firmware_version": self._device_info_cache.get("firmware_version"),
+            KEY_SERIAL_NUMBER: self._cache.serial_number,
+            KEY_FIRMWARE_VERSION: self._cache.firmware_version,
             # WiFi info - None when offline (will show "Offline")
-            "wifi_ssid": None,
-            "wifi_signal": None,
+            KEY_WIFI_SSID: None,
+            KEY_WIFI_SIGNAL: None,
             # Availability flag
-            "available": False,
+            KEY_AVAILABLE: False,
         }
 
     def _check_midnight_reset(self) -> None:
@@ -157,22 +243,48 @@ class DeyeDataUpdateCoordinator(DataUpdateCoordinator):
         now = dt_util.now()
         if self._last_reset_date != now.date():
             _LOGGER.debug("Midnight reset: Resetting daily energy cache")
-            self._energy_cache["today_energy"] = 0.0
+            self._cache.today_energy = 0.0
             self._last_reset_date = now.date()
+            # Yesterday's energy must not come back via a 304 reply
+            if self._last_good_data is not None:
+                self._last_good_data = {**self._last_good_data, KEY_TODAY_ENERGY: 0.0}
+            self._last_modified = None
 
     async def _async_update_data(self) -> dict:
         """Fetch data from the Deye inverter web interface."""
         self._check_midnight_reset()
-        url = f"http://{self.host}/status.html"
         
+        if self.hass.loop.time() < self._circuit_open_until:
+            # Circuit open (inverter asleep) - don't even try the network
+            return self._get_empty_data()
+        
+        wanted = self._wanted_vars()
+        headers = self._headers
+        # status.html is generated on the fly, so a 304 is only trusted for a
+        # limited number of polls, and never when WiFi/device info is due
+        if (
+            self._last_modified is not None
+            and wanted == _POWER_VARS
+            and self._not_modified_count < MAX_NOT_MODIFIED_REPLIES
+        ):
+            headers = {**headers, aiohttp.hdrs.IF_MODIFIED_SINCE: self._last_modified}
+        
+        started = self.hass.loop.time()
         try:
-            auth = aiohttp.BasicAuth(self.username, self.password)
-            # Reduce timeout to prevent overlapping with scan interval
-            # Deye inverters are slow single-threaded devices. 
-            # If it takes >10s, it's likely stuck or busy.
-            timeout = aiohttp.ClientTimeout(total=10, connect=5)
-            
-            async with self._session.get(url, auth=auth, timeout=timeout) as response:
+            async with asyncio.timeout(self._timeout), self._session.get(
+                self._url, headers=headers
+            ) as response:
+                if response.status == 304 and self._last_good_data is not None:
+                    # Page unchanged since the last poll - nothing to parse
+                    self._not_modified_count += 1
+                    _LOGGER.debug(
+                        "Inverter replied 304 Not Modified (%d/%d), reusing last data",
+                        self._not_modified_count,
+                        MAX_NOT_MODIFIED_REPLIES,
+                    )
+                    self._handle_success(self.hass.loop.time() - started)
+                    return self._last_good_data
+                
                 if response.status == 401:
                     _LOGGER.error("Authentication failed - check username and password")
                     self._consecutive_failures += 1
@@ -183,16 +295,19 @@ class DeyeDataUpdateCoordinator(DataUpdateCoordinator):
                     self._consecutive_failures += 1
                     return self._handle_failure(f"HTTP error {response.status}")
                 
-                html = await response.text()
+                found = await self._async_read_status_page(response, wanted)
+                self._last_modified = response.headers.get(aiohttp.hdrs.LAST_MODIFIED)
+                self._not_modified_count = 0
+                self._handle_success(self.hass.loop.time() - started)
                 
-                # Reset failure counter on success
-                self._consecutive_failures = 0
-                self._is_available = True
+                self._last_good_data = self._parse_status_page(found, wanted)
+                return self._last_good_data
                 
-                return self._parse_status_page(html)
-                
-        except asyncio.TimeoutError:
+        except TimeoutError:
             _LOGGER.debug("Timeout connecting to inverter (might be offline/night)")
+            # The reply took at least the whole timeout; count it so a slow
+            # inverter raises the limit instead of timing out forever
+            self._update_timeout(self._timeout)
             self._consecutive_failures += 1
             return self._handle_failure("Connection timeout")
             
@@ -211,8 +326,74 @@ class DeyeDataUpdateCoordinator(DataUpdateCoordinator):
             self._consecutive_failures += 1
             return self._handle_failure(str(err))
 
+    def _wanted_vars(self) -> frozenset[str]:
+        """Return the status.html variables this poll has to read."""
+        # WiFi and device variables are only looked for when their cache is due
+        wanted = _POWER_VARS
+        if self._should_update_wifi():
+            wanted |= _WIFI_VARS
+        if self._should_update_device_info():
+            wanted |= _DEVICE_VARS
+        return wanted
+
+    async def _async_read_status_page(
+        self, response: aiohttp.ClientResponse, wanted: frozenset[str]
+    ) -> dict[str, str]:
+        """Stream status.html and return the wanted variables found in it.
+
+        Stops reading as soon as every wanted variable has arrived.
+        """
+        pattern = _vars_regex(wanted)
+        found: dict[str, str] = {}
+
+        buf = bytearray()
+        pos = 0
+        async for chunk in response.content.iter_chunked(_STREAM_CHUNK_SIZE):
+            buf.extend(chunk)
+            # Rescan from the end of the last complete match, but never further
+            # back than a declaration could reach into the previous chunk; a
+            # variable split across two chunks is picked up once the rest arrives
+            pos = max(pos, len(buf) - len(chunk) - _MAX_VAR_DECLARATION)
+            for match in pattern.finditer(buf, pos):
+                # First occurrence wins; only the short values get decoded
+                found.setdefault(
+                    match.group("k").decode("ascii"),
+                    match.group("v").decode("utf-8", errors="replace"),
+                )
+                pos = match.end()
+            if len(found) == len(wanted):
+                break
+
+        return found
+
+    def _handle_success(self, elapsed: float) -> None:
+        """Reset failure tracking after the inverter answered in `elapsed` seconds."""
+        self._update_timeout(elapsed)
+        # Reset failure counter and polling interval on success
+        self._consecutive_failures = 0
+        self._is_available = True
+        self._circuit_open_until = 0.0
+        if self.update_interval != self._base_interval:
+            _LOGGER.debug("Inverter reachable again, restoring update interval")
+            self.update_interval = self._base_interval
+
+    def _timeout_for_rtt(self) -> int:
+        """Return the total request timeout for the current average response time."""
+        return int(min(self._max_timeout, max(MIN_REQUEST_TIMEOUT, 4 * self._rtt_ewma)))
+
+    def _update_timeout(self, elapsed: float) -> None:
+        """Feed a response time into the average and adapt the request timeout."""
+        self._rtt_ewma = 0.8 * self._rtt_ewma + 0.2 * elapsed
+        total = self._timeout_for_rtt()
+        if total != self._timeout:
+            _LOGGER.debug("Adjusting request timeout to %d seconds", total)
+            self._timeout = total
+
     def _handle_failure(self, reason: str) -> dict:
         """Handle connection failure gracefully."""
+        # Whatever comes back after a failure is fetched in full
+        self._last_modified = None
+        self._not_modified_count = 0
         # Only mark as unavailable after multiple consecutive failures
         if self._consecutive_failures >= self._max_failures_before_unavailable:
             self._is_available = False
@@ -221,6 +402,14 @@ class DeyeDataUpdateCoordinator(DataUpdateCoordinator):
                 self._consecutive_failures,
                 reason
             )
+            self._apply_backoff()
+            if self._consecutive_failures >= CIRCUIT_BREAKER_THRESHOLD:
+                # Open the circuit; the first poll after the window is a single
+                # probe that either closes it again or reopens it
+                _LOGGER.debug(
+                    "Pausing requests to inverter for %d seconds", CIRCUIT_BREAKER_WINDOW
+                )
+                self._circuit_open_until = self.hass.loop.time() + CIRCUIT_BREAKER_WINDOW
             # When truly unavailable (night mode), power is 0
             return self._get_empty_data()
         else:
@@ -232,148 +421,162 @@ class DeyeDataUpdateCoordinator(DataUpdateCoordinator):
             )
             # For short glitches, return last known good values including power
             # This prevents power drops to 0 during short network issues
+            # The coordinator still holds the previous result; hand it back
+            # as-is unless it needs patching (offline flag or midnight reset)
+            prev = self.data
+            if prev is not None:
+                if prev.get(KEY_AVAILABLE) and prev.get(KEY_TODAY_ENERGY) == self._cache.today_energy:
+                    return prev
+                return {
+                    **prev,
+                    KEY_TODAY_ENERGY: self._cache.today_energy,
+                    KEY_AVAILABLE: True,  # Pretend to be available during glitches
+                }
+            # Cold start without any previous result: rebuild from the caches
             return {
-                "current_power": self._energy_cache.get("current_power", 0.0),
-                "today_energy": self._energy_cache.get("today_energy", 0.0),
-                "total_energy": self._energy_cache.get("total_energy", 0.0),
-                "serial_number": self._device_info_cache.get("serial_number"),
-                "firmware_version": self._device_info_cache.get("firmware_version"),
-                "wifi_ssid": self._wifi_info_cache.get("wifi_ssid"),
-                "wifi_signal": self._wifi_info_cache.get("wifi_signal"),
-                "available": True, # Pretend to be available during glitches
+                KEY_CURRENT_POWER: self._cache.current_power,
+                KEY_TODAY_ENERGY: self._cache.today_energy,
+                KEY_TOTAL_ENERGY: self._cache.total_energy,
+                KEY_SERIAL_NUMBER: self._cache.serial_number,
+                KEY_FIRMWARE_VERSION: self._cache.firmware_version,
+                KEY_WIFI_SSID: self._cache.wifi_ssid,
+                KEY_WIFI_SIGNAL: self._cache.wifi_signal,
+                KEY_AVAILABLE: True, # Pretend to be available during glitches
             }
 
+    def _apply_backoff(self) -> None:
+        """Poll less often while the inverter stays unreachable (night mode)."""
+        # Start doubling once the inverter is considered unavailable, so short
+        # glitches are still retried at the normal interval
+        exponent = min(
+            self._consecutive_failures - self._max_failures_before_unavailable + 1,
+            MAX_BACKOFF_EXPONENT,
+        )
+        base = self._base_interval.total_seconds()
+        # Never poll faster than configured, even if scan_interval > the cap
+        seconds = max(base, min(base * 2**exponent, MAX_BACKOFF_INTERVAL))
+        if self.update_interval != timedelta(seconds=seconds):
+            _LOGGER.debug("Backing off, next update in %d seconds", seconds)
+            self.update_interval = timedelta(seconds=seconds)
+
     def _should_update_wifi(self) -> bool:
         """Check if WiFi info should be updated (every 15 minutes)."""
-        if self._last_wifi_update is None:
-            return True
-        elapsed = (datetime.now() - self._last_wifi_update).total_seconds()
-        return elapsed >= WIFI_UPDATE_INTERVAL
+        return (
+            self._last_wifi_update is None
+            or self.hass.loop.time() - self._last_wifi_update >= WIFI_UPDATE_INTERVAL
+        )
 
     def _should_update_device_info(self) -> bool:
         """Check if device info should be updated (once per day)."""
-        if self._last_device_info_update is None:
-            return True
-        elapsed = (datetime.now() - self._last_device_info_update).total_seconds()
-        return elapsed >= DEVICE_INFO_UPDATE_INTERVAL
-
-    def _parse_status_page(self, html: str) -> dict:
-        """Parse the status.html page and extract sensor values from JavaScript variables."""
-        data: dict[str, Any] = {"available": True}
+        return (
+            self._last_device_info_update is None
+            or self.hass.loop.time() - self._last_device_info_update
+            >= DEVICE_INFO_UPDATE_INTERVAL
+        )
+
+    def _parse_status_page(self, found: dict[str, str], wanted: frozenset[str]) -> dict:
+        """Build sensor data from the JavaScript variables extracted from status.html."""
+        data: dict[str, Any] = {KEY_AVAILABLE: True}
         
         # === POWER DATA (always updated) ===
         
         # Current power (W)
-        match = re.search(r'var\s+webdata_now_p\s*=\s*"([^"]*)";', html)
-        if match:
-            data["current_power"] = self._parse_numeric_value(match.group(1))
+        value = found.get("webdata_now_p")
+        if value is not None:
+            data[KEY_CURRENT_POWER] = _parse_float(value)
         else:
             # If parsing fails, use last known value instead of 0 to avoid drops
-            data["current_power"] = self._energy_cache.get("current_power", 0.0)
+            data[KEY_CURRENT_POWER] = self._cache.current_power
             _LOGGER.debug("webdata_now_p not found, using cached value")
         
         # Today's energy (kWh)
-        match = re.search(r'var\s+webdata_today_e\s*=\s*"([^"]*)";', html)
-        if match:
-            new_today = self._parse_numeric_value(match.group(1))
+        value = found.get("webdata_today_e")
+        if value is not None:
+            new_today = _parse_float(value)
             if new_today > 0:
-                data["today_energy"] = new_today
+                data[KEY_TODAY_ENERGY] = new_today
             else:
                 # If parsing returned 0 (error/glitch), keep cached value
-                data["today_energy"] = self._energy_cache.get("today_energy", 0.0)
+                data[KEY_TODAY_ENERGY] = self._cache.today_energy
         else:
-            data["today_energy"] = self._energy_cache.get("today_energy", 0.0)
+            data[KEY_TODAY_ENERGY] = self._cache.today_energy
             _LOGGER.debug("webdata_today_e not found, using cached value")
         
         # Total energy (kWh)
-        match = re.search(r'var\s+webdata_total_e\s*=\s*"([^"]*)";', html)
-        if match:
-            new_total = self._parse_numeric_value(match.group(1))
+        value = found.get("webdata_total_e")
+        if value is not None:
+            new_total = _parse_float(value)
             if new_total > 0:
-                data["total_energy"] = new_total
+                data[KEY_TOTAL_ENERGY] = new_total
             else:
                 # If parsing returned 0 (error/glitch), keep cached value
-                data["total_energy"] = self._energy_cache.get("total_energy", 0.0)
+                data[KEY_TOTAL_ENERGY] = self._cache.total_energy
         else:
             # Keep last known value for total energy
-            data["total_energy"] = self._energy_cache.get("total_energy", 0.0)
+            data[KEY_TOTAL_ENERGY] = self._cache.total_energy
             _LOGGER.debug("webdata_total_e not found, using cached value")
         
-        # Update energy cache with new values (for use when offline)
-        self._energy_cache["current_power"] = data.get("current_power", 0.0)
-        
-        # Only update energy caches if we have valid values
-        if data.get("today_energy", 0.0) > 0:
-            self._energy_cache["today_energy"] = data.get("today_energy", 0.0)
-        
-        # Only update total energy cache if we have a valid value
-        if data.get("total_energy", 0.0) > 0:
-            self._energy_cache["total_energy"] = data.get("total_energy", 0.0)
+        # Update energy cache with new values (for use when offline),
+        # energy values only when valid
+        self._cache.current_power = data[KEY_CURRENT_POWER]
+        if data[KEY_TODAY_ENERGY] > 0:
+            self._cache.today_energy = data[KEY_TODAY_ENERGY]
+        if data[KEY_TOTAL_ENERGY] > 0:
+            self._cache.total_energy = data[KEY_TOTAL_ENERGY]
         
         # === WIFI DATA (updated every 15 minutes) ===
         
-        if self._should_update_wifi():
+        if _WIFI_VARS <= wanted:
             _LOGGER.debug("Updating WiFi information")
             
             # WiFi SSID
-            match = re.search(r'var\s+cover_sta_ssid\s*=\s*"([^"]*)";', html)
-            if match:
-                self._wifi_info_cache["wifi_ssid"] = match.group(1).strip()
+            value = found.get("cover_sta_ssid")
+            if value is not None:
+                self._cache.wifi_ssid = value.strip()
             
             # WiFi Signal strength
-            match = re.search(r'var\s+cover_sta_rssi\s*=\s*"([^"]*)";', html)
-            if match:
-                self._wifi_info_cache["wifi_signal"] = match.group(1).strip()
+            value = found.get("cover_sta_rssi")
+            if value is not None:
+                self._cache.wifi_signal = value.strip()
             
-            self._last_wifi_update = datetime.now()
+            self._last_wifi_update = self.hass.loop.time()
         
         # Add cached WiFi data
-        data["wifi_ssid"] = self._wifi_info_cache.get("wifi_ssid")
-        data["wifi_signal"] = self._wifi_info_cache.get("wifi_signal")
+        data[KEY_WIFI_SSID] = self._cache.wifi_ssid
+        data[KEY_WIFI_SIGNAL] = self._cache.wifi_signal
         
         # === DEVICE INFO (updated once per day) ===
         
-        if self._should_update_device_info():
+        if _DEVICE_VARS <= wanted:
             _LOGGER.debug("Updating device information")
             
             # Serial number
-            match = re.search(r'var\s+webdata_sn\s*=\s*"([^"]*)";', html)
-            if match:
-                self._device_info_cache["serial_number"] = match.group(1).strip()
+            value = found.get("webdata_sn")
+            if value is not None:
+                self._cache.serial_number = value.strip()
             
             # Firmware version
-            match = re.search(r'var\s+cover_ver\s*=\s*"([^"]*)";', html)
-            if match:
-                self._device_info_cache["firmware_version"] = match.group(1).strip()
+            value = found.get("cover_ver")
+            if value is not None:
+                self._cache.firmware_version = value.strip()
             
             # Module ID
-            match = re.search(r'var\s+cover_mid\s*=\s*"([^"]*)";', html)
-            if match:
-                self._device_info_cache["module_id"] = match.group(1).strip()
+            value = found.get("cover_mid")
+            if value is not None:
+                self._cache.module_id = value.strip()
             
-            self._last_device_info_update = datetime.now()
+            self._last_device_info_update = self.hass.loop.time()
         
         # Add cached device data
-        data["serial_number"] = self._device_info_cache.get("serial_number")
-        data["firmware_version"] = self._device_info_cache.get("firmware_version")
-        data["module_id"] = self._device_info_cache.get("module_id")
+        data[KEY_SERIAL_NUMBER] = self._cache.serial_number
+        data[KEY_FIRMWARE_VERSION] = self._cache.firmware_version
+        data[KEY_MODULE_ID] = self._cache.module_id
         
         _LOGGER.debug("Parsed data: power=%s W, today=%s kWh, total=%s kWh",
-                      data.get("current_power"), data.get("today_energy"), data.get("total_energy"))
+                      data.get(KEY_CURRENT_POWER), data.get(KEY_TODAY_ENERGY), data.get(KEY_TOTAL_ENERGY))
         
         return data
 
-    def _parse_numeric_value(self, text: str) -> float:
-        """Parse numeric value from text. Returns 0.0 on failure."""
-        try:
-            value = text.strip()
-            if not value or value == "---" or value == "":
-                return 0.0
-            return float(value)
-        except (ValueError, AttributeError) as err:
-            _LOGGER.debug("Could not parse numeric value '%s': %s", text, err)
-            return 0.0
-
     @property
     def is_inverter_available(self) -> bool:
         """Return True if the inverter is currently reachable."""
@@ -51,8 +51,10 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
             if response.status != 200:
                 raise CannotConnect
             
-            html = await response.text()
-            if "webdata_now_p" not in html:
+            # Read raw bytes: text() would run charset detection when the
+            # inverter omits the charset header, and the marker is plain ASCII
+            html = await response.read()
+            if b"webdata_now_p" not in html:
                 raise CannotConnect("Could not find expected data in response")
                 
     except aiohttp.ClientError as err:
@@ -13,6 +13,38 @@ DEFAULT_USERNAME = "admin"
 DEFAULT_PASSWORD = "admin"
 DEFAULT_SCAN_INTERVAL = 30  # seconds
 
+# Keys of the coordinator data, shared by the coordinator and the sensors.
+# Identifier-like literals are interned by CPython, so lookups with these
+# constants hit the dict's pointer-equality fast path.
+KEY_AVAILABLE = "available"
+KEY_CURRENT_POWER = "current_power"
+KEY_TODAY_ENERGY = "today_energy"
+KEY_TOTAL_ENERGY = "total_energy"
+KEY_SERIAL_NUMBER = "serial_number"
+KEY_FIRMWARE_VERSION = "firmware_version"
+KEY_MODULE_ID = "module_id"
+KEY_WIFI_SSID = "wifi_ssid"
+KEY_WIFI_SIGNAL = "wifi_signal"
+
 # Update intervals for different data types
 WIFI_UPDATE_INTERVAL = 900  # 15 minutes in seconds
 DEVICE_INFO_UPDATE_INTERVAL = 86400  # 24 hours in seconds
+
+# Backoff while the inverter is unreachable (e.g. at night)
+MAX_BACKOFF_INTERVAL = 900  # 15 minutes in seconds
+MAX_BACKOFF_EXPONENT = 6
+
+# Circuit breaker: stop touching the network for a while after many failures
+CIRCUIT_BREAKER_THRESHOLD = 10  # consecutive failures
+CIRCUIT_BREAKER_WINDOW = 1800  # 30 minutes in seconds
+
+# Conditional GET: after this many 304 replies in a row the page is fetched
+# unconditionally, in case the inverter sends a fixed Last-Modified. Kept
+# small, since a 304 also repeats the last current power reading
+MAX_NOT_MODIFIED_REPLIES = 2
+
+# Adaptive request timeout, derived from the inverter's measured response time.
+# Never below the former fixed 10s, and never long enough to make polls drift
+# (additionally capped at the scan interval)
+MIN_REQUEST_TIMEOUT = 10  # seconds
+MAX_REQUEST_TIMEOUT = 20  # seconds
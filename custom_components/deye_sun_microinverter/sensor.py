@@ -1,11 +1,16 @@
 """Sensor platform for Deye SUN Inverter integration."""
 from __future__ import annotations
 
+from bisect import bisect_right
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from typing import Any
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
@@ -14,15 +19,196 @@ from homeassistant.const import (
     UnitOfEnergy,
     UnitOfPower,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt as dt_util
 
 from . import DeyeDataUpdateCoordinator
-from .const import DOMAIN, CONF_HOST
+from .const import (
+    DOMAIN,
+    CONF_HOST,
+    KEY_AVAILABLE,
+    KEY_CURRENT_POWER,
+    KEY_TODAY_ENERGY,
+    KEY_TOTAL_ENERGY,
+    KEY_SERIAL_NUMBER,
+    KEY_FIRMWARE_VERSION,
+    KEY_WIFI_SSID,
+    KEY_WIFI_SIGNAL,
+)
+
+
+# The coordinator already stores every value with its final type (float
+# for power and energy, str or None for the rest), so the value functions
+# below are plain lookups without any conversion.
+
+
+def _string_or(key: str, fallback: str) -> Callable[[dict[str, Any] | None], str]:
+    """Return a value function giving the string value, or fallback if missing."""
+
+    def value_fn(data: dict[str, Any] | None) -> str:
+        value = None if data is None else data.get(key)
+        return fallback if value is None else value
+
+    return value_fn
+
+
+def _number(key: str) -> Callable[[dict[str, Any] | None], float]:
+    """Return a value function giving a power or energy value, 0 when offline."""
+
+    def value_fn(data: dict[str, Any] | None) -> float:
+        return 0.0 if data is None else data.get(key, 0.0)
+
+    return value_fn
+
+
+def _status(data: dict[str, Any] | None) -> str:
+    """Return the inverter status as a string."""
+    if data is None:
+        return "Unbekannt"
+    return "Online" if data.get(KEY_AVAILABLE, False) else "Offline (Nachtmodus)"
+
+
+def _status_icon(value: str) -> str:
+    """Return icon based on status."""
+    return "mdi:power-plug" if value == "Online" else "mdi:power-plug-off"
+
+
+# Lower bounds (in %) of the signal icons after "off"
+_SIGNAL_THRESHOLDS = (1, 25, 50, 75)
+_SIGNAL_ICONS = (
+    "mdi:wifi-strength-off",
+    "mdi:wifi-strength-1",
+    "mdi:wifi-strength-2",
+    "mdi:wifi-strength-3",
+    "mdi:wifi-strength-4",
+)
+
+
+def _wifi_signal_icon(value: str) -> str:
+    """Return icon based on signal strength."""
+    if value == "Offline":
+        return "mdi:wifi-strength-off"
+
+    try:
+        # Parse percentage value like "49%"
+        signal = int(value.rstrip("%"))
+    except (ValueError, AttributeError):
+        return "mdi:wifi-strength-alert-outline"
+    return _SIGNAL_ICONS[bisect_right(_SIGNAL_THRESHOLDS, signal)]
+
+
+# Built once and shared, so an update only swaps the reference when the
+# inverter goes on- or offline; never mutated
+_ONLINE_ATTRIBUTES = {"inverter_online": True}
+_OFFLINE_ATTRIBUTES = {"inverter_online": False}
+
+
+def _power_attributes(data: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Return additional state attributes for the main power sensor."""
+    if data is None:
+        return None
+    return _ONLINE_ATTRIBUTES if data.get(KEY_AVAILABLE, False) else _OFFLINE_ATTRIBUTES
+
+
+@dataclass(frozen=True, kw_only=True)
+class DeyeSensorEntityDescription(SensorEntityDescription):
+    """Describes a Deye sensor."""
+
+    value_fn: Callable[[dict[str, Any] | None], Any]
+    icon_fn: Callable[[Any], str] | None = None
+    attributes_fn: Callable[[dict[str, Any] | None], dict[str, Any] | None] | None = None
+    # Keep the last value across restarts and offline periods (energy sensors)
+    restore: bool = False
+    # Forget the kept value at midnight (daily energy)
+    daily_reset: bool = False
+    # Per-sensor part of the unique id, built once with the description
+    unique_id_suffix: str = field(init=False, default="")
+
+    def __post_init__(self) -> None:
+        """Precompute the unique id suffix."""
+        object.__setattr__(self, "unique_id_suffix", f"_{self.key}")
+
+
+SENSORS: tuple[DeyeSensorEntityDescription, ...] = (
+    # Power sensors (always updated)
+    DeyeSensorEntityDescription(
+        key=KEY_CURRENT_POWER,
+        name="Aktuelle Leistung",
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        value_fn=_number(KEY_CURRENT_POWER),
+        attributes_fn=_power_attributes,
+    ),
+    DeyeSensorEntityDescription(
+        key=KEY_TODAY_ENERGY,
+        name="Energie Heute",
+        icon="mdi:solar-power-variant",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=1,
+        value_fn=_number(KEY_TODAY_ENERGY),
+        restore=True,
+        daily_reset=True,
+    ),
+    DeyeSensorEntityDescription(
+        key=KEY_TOTAL_ENERGY,
+        name="Energie Gesamt",
+        icon="mdi:solar-power-variant-outline",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=1,
+        value_fn=_number(KEY_TOTAL_ENERGY),
+        restore=True,
+    ),
+    # WiFi sensors (updated every 15 minutes)
+    DeyeSensorEntityDescription(
+        key=KEY_WIFI_SSID,
+        name="WLAN Netzwerk",
+        icon="mdi:wifi",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_string_or(KEY_WIFI_SSID, "Offline"),
+    ),
+    DeyeSensorEntityDescription(
+        key=KEY_WIFI_SIGNAL,
+        name="WLAN Signalstärke",
+        icon="mdi:wifi-strength-3",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_string_or(KEY_WIFI_SIGNAL, "Offline"),
+        icon_fn=_wifi_signal_icon,
+    ),
+    # Device info sensors (updated once per day)
+    DeyeSensorEntityDescription(
+        key=KEY_SERIAL_NUMBER,
+        name="Seriennummer",
+        icon="mdi:identifier",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_string_or(KEY_SERIAL_NUMBER, "Unbekannt"),
+    ),
+    DeyeSensorEntityDescription(
+        key=KEY_FIRMWARE_VERSION,
+        name="Firmware Version",
+        icon="mdi:chip",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_string_or(KEY_FIRMWARE_VERSION, "Unbekannt"),
+    ),
+    # Status sensor
+    DeyeSensorEntityDescription(
+        key=KEY_AVAILABLE,
+        name="Status",
+        icon="mdi:power-plug",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_status,
+        icon_fn=_status_icon,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -34,375 +220,121 @@ async def async_setup_entry(
     coordinator: DeyeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
     host = entry.data[CONF_HOST]
 
-    sensors = [
-        # Power sensors (always updated)
-        DeyeCurrentPowerSensor(coordinator, host),
-        DeyeTodayEnergySensor(coordinator, host),
-        DeyeTotalEnergySensor(coordinator, host),
-        # WiFi sensors (updated every 15 minutes)
-        DeyeWifiSsidSensor(coordinator, host),
-        DeyeWifiSignalSensor(coordinator, host),
-        # Device info sensors (updated once per day)
-        DeyeSerialNumberSensor(coordinator, host),
-        DeyeFirmwareVersionSensor(coordinator, host),
-        # Status sensor
-        DeyeStatusSensor(coordinator, host),
-    ]
-
-    async_add_entities(sensors)
+    # Device info for grouping sensors, shared by all sensors of this inverter
+    device_info = DeviceInfo(
+        identifiers={(DOMAIN, host)},
+        name="Deye Micro-Inverter",
+        manufacturer="Deye",
+        model="SUN Series Micro-Inverter",
+        configuration_url=f"http://{host}/",
+    )
+
+    async_add_entities(
+        (DeyeRestoreSensor if description.restore else DeyeSensor)(
+            coordinator, host, description, device_info
+        )
+        for description in SENSORS
+    )
 
 
-class DeyeBaseSensor(CoordinatorEntity[DeyeDataUpdateCoordinator], SensorEntity):
-    """Base class for Deye sensors."""
+class DeyeSensor(CoordinatorEntity[DeyeDataUpdateCoordinator], SensorEntity):
+    """Representation of a Deye sensor."""
 
+    entity_description: DeyeSensorEntityDescription
     _attr_has_entity_name = True
 
     def __init__(
         self,
         coordinator: DeyeDataUpdateCoordinator,
         host: str,
-        name: str,
-        key: str,
-        icon: str,
-        device_class: SensorDeviceClass | None = None,
-        state_class: SensorStateClass | None = None,
-        unit: str | None = None,
-        entity_category: str | None = None,
+        description: DeyeSensorEntityDescription,
+        device_info: DeviceInfo,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_name = name
-        self._key = key
-        self._attr_icon = icon
-        self._attr_unique_id = f"deye_inverter_{host}_{key}"
-        self._host = host
-        
-        if device_class:
-            self._attr_device_class = device_class
-        if state_class:
-            self._attr_state_class = state_class
-        if unit:
-            self._attr_native_unit_of_measurement = unit
-        if entity_category:
-            self._attr_entity_category = EntityCategory(entity_category)
-
-        # Device info for grouping sensors
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, host)},
-            "name": f"Deye Micro-Inverter",
-            "manufacturer": "Deye",
-            "model": "SUN Series Micro-Inverter",
-            "configuration_url": f"http://{host}/",
-        }
+        self.entity_description = description
+        self._attr_unique_id = f"deye_inverter_{host}{description.unique_id_suffix}"
+        self._attr_device_info = device_info
 
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get(self._key)
+    async def async_added_to_hass(self) -> None:
+        """Take the initial state from the coordinator once added."""
+        await super().async_added_to_hass()
+        self._update_attrs()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Snapshot the new coordinator data so state reads are attribute loads."""
+        self._update_attrs()
+        self.async_write_ha_state()
+
+    def _update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        description = self.entity_description
+        data = self.coordinator.data
+        self._attr_native_value = self._compute_value(data)
+        if description.icon_fn is not None:
+            self._attr_icon = description.icon_fn(self._attr_native_value)
+        if description.attributes_fn is not None:
+            self._attr_extra_state_attributes = description.attributes_fn(data)
+
+    def _compute_value(self, data: dict[str, Any] | None) -> Any:
+        """Return the sensor value for the given coordinator data."""
+        return self.entity_description.value_fn(data)
 
     @property
     def available(self) -> bool:
         """Return True - sensors are always available to preserve dashboard calculations."""
-        # Always return True to prevent "unavailable" state which breaks dashboards
+        # CoordinatorEntity would report last_update_success here; always
+        # return True to prevent "unavailable" state which breaks dashboards
         return True
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any] | None:
-        """Return additional state attributes."""
-        if self.coordinator.data is None:
-            return None
-        
-        # Only add attributes for the main power sensor
-        if self._key == "current_power":
-            return {
-                "inverter_online": self.coordinator.data.get("available", False),
-            }
-        
-        return None
 
+class DeyeRestoreSensor(DeyeSensor, RestoreSensor):
+    """Energy sensor that keeps its last value while the inverter is offline."""
 
-class DeyeCurrentPowerSensor(DeyeBaseSensor):
-    """Sensor for current power generation."""
-
-    def __init__(self, coordinator: DeyeDataUpdateCoordinator, host: str) -> None:
-        """Initialize the current power sensor."""
-        super().__init__(
-            coordinator=coordinator,
-            host=host,
-            name="Aktuelle Leistung",
-            key="current_power",
-            icon="mdi:solar-power",
-            device_class=SensorDeviceClass.POWER,
-            state_class=SensorStateClass.MEASUREMENT,
-            unit=UnitOfPower.WATT,
-        )
-
-    @property
-    def native_value(self) -> float:
-        """Return 0 when offline (no power production at night)."""
-        if self.coordinator.data is None:
-            return 0.0
-        value = self.coordinator.data.get(self._key)
-        if value is None:
-            return 0.0
-        return float(value)
-
-
-class DeyeTodayEnergySensor(DeyeBaseSensor, RestoreEntity):
-    """Sensor for today's energy generation."""
-
-    def __init__(self, coordinator: DeyeDataUpdateCoordinator, host: str) -> None:
-        """Initialize the today's energy sensor."""
-        super().__init__(
-            coordinator=coordinator,
-            host=host,
-            name="Energie Heute",
-            key="today_energy",
-            icon="mdi:solar-power-variant",
-            device_class=SensorDeviceClass.ENERGY,
-            state_class=SensorStateClass.TOTAL_INCREASING,
-            unit=UnitOfEnergy.KILO_WATT_HOUR,
-        )
-        self._attr_suggested_display_precision = 1
-        self._last_known_value = None
+    def __init__(
+        self,
+        coordinator: DeyeDataUpdateCoordinator,
+        host: str,
+        description: DeyeSensorEntityDescription,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, host, description, device_info)
+        self._last_known_value: float | None = None
         self._last_reset_date = dt_util.now().date()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
         await super().async_added_to_hass()
-        if (last_state := await self.async_get_last_state()) is not None:
+        if (last_data := await self.async_get_last_sensor_data()) is not None:
+            self._last_known_value = last_data.native_value
+        elif (last_state := await self.async_get_last_state()) is not None:
+            # Saved before the typed sensor data was stored
             try:
                 self._last_known_value = float(last_state.state)
             except ValueError:
                 pass
+        self._update_attrs()
 
-    @property
-    def native_value(self) -> float:
-        """Return cached value when offline to preserve dashboard calculations."""
+    def _compute_value(self, data: dict[str, Any] | None) -> float:
+        """Use cached value when offline to preserve dashboard calculations."""
         # Check for midnight reset
-        now = dt_util.now()
-        if self._last_reset_date != now.date():
-            self._last_known_value = None
-            self._last_reset_date = now.date()
-
-        val = 0.0
-        if self.coordinator.data is not None:
-            val = self.coordinator.data.get(self._key, 0.0)
-        
-        # If we have a valid value from coordinator, use it and update last known
-        if val > 0:
-            self._last_known_value = val
-            return val
-        
-        # If coordinator has 0 (offline/restart), return last known value
-        if self._last_known_value is not None:
-            return self._last_known_value
-            
-        return 0.0
+        if self.entity_description.daily_reset:
+            now = dt_util.now()
+            if self._last_reset_date != now.date():
+                self._last_known_value = None
+                self._last_reset_date = now.date()
 
+        val = self.entity_description.value_fn(data)
 
-class DeyeTotalEnergySensor(DeyeBaseSensor, RestoreEntity):
-    """Sensor for total energy generation."""
-
-    def __init__(self, coordinator: DeyeDataUpdateCoordinator, host: str) -> None:
-        """Initialize the total energy sensor."""
-        super().__init__(
-            coordinator=coordinator,
-            host=host,
-            name="Energie Gesamt",
-            key="total_energy",
-            icon="mdi:solar-power-variant-outline",
-            device_class=SensorDeviceClass.ENERGY,
-            state_class=SensorStateClass.TOTAL_INCREASING,
-            unit=UnitOfEnergy.KILO_WATT_HOUR,
-        )
-        self._attr_suggested_display_precision = 1
-        self._last_known_value = None
-
-    async def async_added_to_hass(self) -> None:
-        """Handle entity which will be added."""
-        await super().async_added_to_hass()
-        if (last_state := await self.async_get_last_state()) is not None:
-            try:
-                self._last_known_value = float(last_state.state)
-            except ValueError:
-                pass
-
-    @property
-    def native_value(self) -> float:
-        """Return cached value when offline to preserve dashboard calculations."""
-        val = 0.0
-        if self.coordinator.data is not None:
-            val = self.coordinator.data.get(self._key, 0.0)
-        
         # If we have a valid value from coordinator, use it and update last known
         if val > 0:
             self._last_known_value = val
             return val
-        
-        # If coordinator has 0 (offline/restart), return last known value
+
+        # If coordinator has 0 (offline/restart), use last known value
         if self._last_known_value is not None:
             return self._last_known_value
-            
-        return 0.0
-
-
-class DeyeWifiSsidSensor(DeyeBaseSensor):
-    """Sensor for WiFi SSID."""
-
-    def __init__(self, coordinator: DeyeDataUpdateCoordinator, host: str) -> None:
-        """Initialize the WiFi SSID sensor."""
-        super().__init__(
-            coordinator=coordinator,
-            host=host,
-            name="WLAN Netzwerk",
-            key="wifi_ssid",
-            icon="mdi:wifi",
-            entity_category="diagnostic",
-        )
 
-    @property
-    def native_value(self) -> str:
-        """Return 'Offline' when inverter is not connected."""
-        if self.coordinator.data is None:
-            return "Offline"
-        value = self.coordinator.data.get(self._key)
-        if value is None:
-            return "Offline"
-        return str(value)
-
-
-class DeyeWifiSignalSensor(DeyeBaseSensor):
-    """Sensor for WiFi signal strength."""
-
-    def __init__(self, coordinator: DeyeDataUpdateCoordinator, host: str) -> None:
-        """Initialize the WiFi signal sensor."""
-        super().__init__(
-            coordinator=coordinator,
-            host=host,
-            name="WLAN Signalstärke",
-            key="wifi_signal",
-            icon="mdi:wifi-strength-3",
-            entity_category="diagnostic",
-        )
-
-    @property
-    def native_value(self) -> str:
-        """Return 'Offline' when inverter is not connected."""
-        if self.coordinator.data is None:
-            return "Offline"
-        value = self.coordinator.data.get(self._key)
-        if value is None:
-            return "Offline"
-        return str(value)
-
-    @property
-    def icon(self) -> str:
-        """Return icon based on signal strength."""
-        value = self.native_value
-        if value == "Offline" or value is None:
-            return "mdi:wifi-strength-off"
-        
-        try:
-            # Parse percentage value like "49%"
-            signal = int(value.replace("%", ""))
-            if signal >= 75:
-                return "mdi:wifi-strength-4"
-            elif signal >= 50:
-                return "mdi:wifi-strength-3"
-            elif signal >= 25:
-                return "mdi:wifi-strength-2"
-            elif signal > 0:
-                return "mdi:wifi-strength-1"
-            else:
-                return "mdi:wifi-strength-off"
-        except (ValueError, AttributeError):
-            return "mdi:wifi-strength-alert-outline"
-
-
-class DeyeSerialNumberSensor(DeyeBaseSensor):
-    """Sensor for device serial number."""
-
-    def __init__(self, coordinator: DeyeDataUpdateCoordinator, host: str) -> None:
-        """Initialize the serial number sensor."""
-        super().__init__(
-            coordinator=coordinator,
-            host=host,
-            name="Seriennummer",
-            key="serial_number",
-            icon="mdi:identifier",
-            entity_category="diagnostic",
-        )
-
-    @property
-    def native_value(self) -> str | None:
-        """Return cached serial number or 'Unbekannt' if never fetched."""
-        if self.coordinator.data is None:
-            return "Unbekannt"
-        value = self.coordinator.data.get(self._key)
-        if value is None:
-            return "Unbekannt"
-        return str(value)
-
-
-class DeyeFirmwareVersionSensor(DeyeBaseSensor):
-    """Sensor for firmware version."""
-
-    def __init__(self, coordinator: DeyeDataUpdateCoordinator, host: str) -> None:
-        """Initialize the firmware version sensor."""
-        super().__init__(
-            coordinator=coordinator,
-            host=host,
-            name="Firmware Version",
-            key="firmware_version",
-            icon="mdi:chip",
-            entity_category="diagnostic",
-        )
-
-    @property
-    def native_value(self) -> str | None:
-        """Return cached firmware version or 'Unbekannt' if never fetched."""
-        if self.coordinator.data is None:
-            return "Unbekannt"
-        value = self.coordinator.data.get(self._key)
-        if value is None:
-            return "Unbekannt"
-        return str(value)
-
-
-class DeyeStatusSensor(DeyeBaseSensor):
-    """Sensor for inverter online/offline status."""
-
-    def __init__(self, coordinator: DeyeDataUpdateCoordinator, host: str) -> None:
-        """Initialize the status sensor."""
-        super().__init__(
-            coordinator=coordinator,
-            host=host,
-            name="Status",
-            key="available",
-            icon="mdi:power-plug",
-            entity_category="diagnostic",
-        )
-
-    @property
-    def native_value(self) -> str:
-        """Return the status as a string."""
-        if self.coordinator.data is None:
-            return "Unbekannt"
-        available = self.coordinator.data.get("available", False)
-        return "Online" if available else "Offline (Nachtmodus)"
-
-    @property
-    def icon(self) -> str:
-        """Return icon based on status."""
-        if self.coordinator.data is None:
-            return "mdi:power-plug-off"
-        available = self.coordinator.data.get("available", False)
-        return "mdi:power-plug" if available else "mdi:power-plug-off"
-
-    @property
-    def available(self) -> bool:
-        """Status sensor is always available."""
-        return True
+        return 0.0
@@ -19,11 +19,11 @@ Usage:
 
 import argparse
 import asyncio
-import re
+import logging
 import sys
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
 
 try:
     import aiohttp
@@ -32,8 +32,10 @@ except ImportError:
     print("  pip install aiohttp")
     sys.exit(1)
 
+_LOGGER = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class InverterData:
     """Data class for inverter readings."""
     # Connection status
@@ -56,127 +58,219 @@ class InverterData:
     wifi_ip: Optional[str] = None
     wifi_mac: Optional[str] = None
     
-    # Raw data for debugging
-    raw_html: str = ""
+    # Raw response for debugging, only kept for --save-html
+    raw_html: bytes = b""
 
 
-def parse_numeric_value(text: str) -> float:
-    """Parse numeric value from text. Returns 0.0 on failure."""
-    try:
-        value = text.strip()
-        if not value or value == "---" or value == "":
-            return 0.0
-        return float(value)
-    except (ValueError, AttributeError):
-        return 0.0
+# status.html variable -> (InverterData field, label)
+KEY_MAP = {
+    # Device info
+    "webdata_sn": ("serial_number", "Serial Number"),
+    "cover_ver": ("firmware_version", "Firmware"),
+    "cover_mid": ("module_id", "Module ID"),
+    # WiFi info
+    "cover_sta_ssid": ("wifi_ssid", "SSID"),
+    "cover_sta_rssi": ("wifi_signal", "Signal"),
+    "cover_sta_ip": ("wifi_ip", "IP"),
+    "cover_sta_mac": ("wifi_mac", "MAC"),
+    # Power data
+    "webdata_now_p": ("current_power", "Current Power"),
+    "webdata_today_e": ("today_energy", "Today Energy"),
+    "webdata_total_e": ("total_energy", "Total Energy"),
+}
+
+# Numeric variables and their units; missing ones default to 0
+NUMERIC_UNITS = {
+    "webdata_now_p": "W",
+    "webdata_today_e": "kWh",
+    "webdata_total_e": "kWh",
+}
+NUMERIC_KEYS = frozenset(NUMERIC_UNITS)
+
+# Variable names as they appear in the raw bytes of the page
+VAR_NAMES = {name.encode(): name for name in KEY_MAP}
+# How far past "var" / "=" the "=" / opening quote may be
+NAME_WINDOW = 64
+QUOTE_WINDOW = 8
+# Upper bound for one whole declaration, used to limit streaming rescans
+MAX_DECLARATION = 512
 
+CHUNK_SIZE = 8192
+REQUEST_TIMEOUT = 10  # seconds
+HRULE = "─" * 44  # horizontal rule of the result tables
 
-def parse_status_page(html: str) -> InverterData:
+
+def iter_vars(buf: bytes, pos: int = 0) -> Iterator[tuple[str, bytes, int]]:
+    """Yield (name, value, end) for each known `var NAME = "VALUE";` from pos on.
+    
+    Accepts the same layout as the integration's regex (any whitespace
+    after `var` and around `=`, a closing `";`), but walks it with plain
+    bytes.find calls. Stops at a declaration cut off by the end of buf,
+    so a streaming caller can resume from the last end once more data
+    has arrived.
+    """
+    end = len(buf)
+    while (start := buf.find(b"var", pos)) >= 0:
+        name_start = start + 3
+        if name_start >= end:
+            return
+        if not buf[name_start:name_start + 1].isspace():
+            pos = name_start
+            continue
+        eq = buf.find(b"=", name_start, name_start + NAME_WINDOW)
+        if eq < 0:
+            if name_start + NAME_WINDOW > end:
+                return
+            pos = name_start
+            continue
+        q1 = buf.find(b'"', eq + 1, eq + QUOTE_WINDOW)
+        if q1 < 0:
+            if eq + QUOTE_WINDOW > end:
+                return
+            pos = name_start
+            continue
+        q2 = buf.find(b'"', q1 + 1)
+        if q2 < 0 or q2 + 1 >= end:
+            return
+        name = VAR_NAMES.get(bytes(buf[name_start:eq]).strip())
+        if name is None or buf[eq + 1:q1].strip() or buf[q2 + 1:q2 + 2] != b";":
+            # Not one of ours, not a string literal, or no closing `";`
+            pos = name_start
+            continue
+        yield name, bytes(buf[q1 + 1:q2]), q2 + 2
+        pos = q2 + 2
+
+
+def parse_status_page(html: bytes, keep_html: bool = False) -> InverterData:
     """Parse the status.html page and extract all sensor values from JavaScript variables."""
-    data = InverterData(raw_html=html, available=True)
-    
-    print("\n📊 Parsing inverter data...")
-    
-    # === DEVICE INFO ===
-    print("\n  [Device Info]")
-    
-    # Serial number
-    match = re.search(r'var\s+webdata_sn\s*=\s*"([^"]*)";', html)
-    if match:
-        data.serial_number = match.group(1).strip()
-        print(f"    ✓ Serial Number: {data.serial_number}")
-    else:
-        print("    ✗ Serial Number: not found")
-    
-    # Firmware version
-    match = re.search(r'var\s+cover_ver\s*=\s*"([^"]*)";', html)
-    if match:
-        data.firmware_version = match.group(1).strip()
-        print(f"    ✓ Firmware: {data.firmware_version}")
-    else:
-        print("    ✗ Firmware: not found")
-    
-    # Module ID
-    match = re.search(r'var\s+cover_mid\s*=\s*"([^"]*)";', html)
-    if match:
-        data.module_id = match.group(1).strip()
-        print(f"    ✓ Module ID: {data.module_id}")
-    else:
-        print("    ✗ Module ID: not found")
-    
-    # === WIFI INFO ===
-    print("\n  [WiFi Info]")
-    
-    # WiFi SSID
-    match = re.search(r'var\s+cover_sta_ssid\s*=\s*"([^"]*)";', html)
-    if match:
-        data.wifi_ssid = match.group(1).strip()
-        print(f"    ✓ SSID: {data.wifi_ssid}")
-    else:
-        print("    ✗ SSID: not found")
-    
-    # WiFi Signal strength
-    match = re.search(r'var\s+cover_sta_rssi\s*=\s*"([^"]*)";', html)
-    if match:
-        data.wifi_signal = match.group(1).strip()
-        print(f"    ✓ Signal: {data.wifi_signal}")
-    else:
-        print("    ✗ Signal: not found")
-    
-    # WiFi IP
-    match = re.search(r'var\s+cover_sta_ip\s*=\s*"([^"]*)";', html)
-    if match:
-        data.wifi_ip = match.group(1).strip()
-        print(f"    ✓ IP: {data.wifi_ip}")
-    else:
-        print("    ✗ IP: not found")
-    
-    # WiFi MAC
-    match = re.search(r'var\s+cover_sta_mac\s*=\s*"([^"]*)";', html)
-    if match:
-        data.wifi_mac = match.group(1).strip()
-        print(f"    ✓ MAC: {data.wifi_mac}")
-    else:
-        print("    ✗ MAC: not found")
-    
-    # === POWER DATA ===
-    print("\n  [Power Data]")
-    
-    # Current power (W)
-    match = re.search(r'var\s+webdata_now_p\s*=\s*"([^"]*)";', html)
-    if match:
-        raw_value = match.group(1)
-        data.current_power = parse_numeric_value(raw_value)
-        print(f"    ✓ Current Power: {data.current_power} W")
-    else:
-        data.current_power = 0.0
-        print("    ✗ Current Power: not found (using 0)")
-    
-    # Today's energy (kWh)
-    match = re.search(r'var\s+webdata_today_e\s*=\s*"([^"]*)";', html)
-    if match:
-        raw_value = match.group(1)
-        data.today_energy = parse_numeric_value(raw_value)
-        print(f"    ✓ Today Energy: {data.today_energy} kWh")
-    else:
-        data.today_energy = 0.0
-        print("    ✗ Today Energy: not found (using 0)")
+    data = InverterData(raw_html=html if keep_html else b"", available=True)
+    
+    # One pass over the HTML collects every variable we know about, stored
+    # already as the native type; only the short captured values get decoded
+    found = {}
+    for key, raw, _end in iter_vars(html):
+        raw = raw.strip()
+        if key in NUMERIC_KEYS:
+            # float() takes bytes directly; "---" or empty means no reading
+            try:
+                found[key] = 0.0 if raw in (b"", b"---") else float(raw)
+            except ValueError:
+                found[key] = 0.0
+        else:
+            found[key] = raw.decode("utf-8", errors="replace")
+    
+    # No known variable at all means this is not the status page we expect
+    if not found:
+        data.available = False
+        data.error_message = "Invalid response format"
+        return data
     
-    # Total energy (kWh)
-    match = re.search(r'var\s+webdata_total_e\s*=\s*"([^"]*)";', html)
-    if match:
-        raw_value = match.group(1)
-        data.total_energy = parse_numeric_value(raw_value)
-        print(f"    ✓ Total Energy: {data.total_energy} kWh")
-    else:
-        data.total_energy = 0.0
-        print("    ✗ Total Energy: not found (using 0)")
+    for key, (attr, _label) in KEY_MAP.items():
+        value = found.get(key)
+        if value is None:
+            _LOGGER.debug("%s not found", key)
+            if key in NUMERIC_KEYS:
+                setattr(data, attr, 0.0)
+        else:
+            setattr(data, attr, value)
+    
+    # One summary line instead of a write per field
+    if _LOGGER.isEnabledFor(logging.INFO):
+        summary = []
+        for key, (attr, label) in KEY_MAP.items():
+            unit = NUMERIC_UNITS.get(key)
+            value = getattr(data, attr)
+            summary.append(f"{label}: {value} {unit}" if unit else f"{label}: {value}")
+        _LOGGER.info("Parsed %s", ", ".join(summary))
     
     return data
 
 
-async def test_connection(host: str, username: str, password: str) -> InverterData:
-    """Test connection to the Deye inverter."""
+async def read_status_page(response: aiohttp.ClientResponse, full: bool = False) -> bytes:
+    """Stream status.html, stopping as soon as every known variable was seen.
+    
+    With full set the whole page is read, e.g. to save it for debugging.
+    """
+    if full:
+        return await response.read()
+    
+    buf = bytearray()
+    seen = set()
+    pos = 0
+    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+        buf += chunk
+        # Rescan from the end of the last complete match, but never further
+        # back than a declaration could reach into the previous chunk
+        pos = max(pos, len(buf) - len(chunk) - MAX_DECLARATION)
+        for name, _value, end in iter_vars(buf, pos):
+            seen.add(name)
+            pos = end
+        if len(seen) == len(KEY_MAP):
+            break
+    return bytes(buf)
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create a keep-alive session with a single connection to the inverter."""
+    connector = aiohttp.TCPConnector(limit=1, ttl_dns_cache=300, enable_cleanup_closed=True)
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def fetch_status(
+    session: aiohttp.ClientSession,
+    url: str,
+    auth: aiohttp.BasicAuth,
+    data: InverterData,
+    keep_html: bool = False,
+) -> InverterData:
+    """Request status.html and parse it, reporting HTTP level problems in data."""
+    print(f"\n📡 Connecting to inverter...")
+    
+    async with session.get(url, auth=auth) as response:
+        print(f"📬 Response status: {response.status}")
+        
+        if response.status == 401:
+            data.available = False
+            data.error_message = "Authentication failed"
+            print("\n❌ ERROR: Authentication failed!")
+            print("   Check your username and password.")
+            return data
+        
+        if response.status != 200:
+            data.available = False
+            data.error_message = f"HTTP error {response.status}"
+            print(f"\n❌ ERROR: Unexpected HTTP status {response.status}")
+            return data
+        
+        print("📥 Reading response data...")
+        # A saved page has to be complete, so only stop early when not keeping it
+        html = await read_status_page(response, full=keep_html)
+        data = parse_status_page(html, keep_html)
+        
+        # The parse itself tells us whether we got valid data
+        if not data.available:
+            print("\n⚠ WARNING: Could not find expected data in response!")
+            print("   The page structure might be different.")
+            print("\n--- First 2000 characters of response ---")
+            print(html[:2000].decode("utf-8", errors="replace"))
+            print("--- End of preview ---\n")
+        
+        return data
+
+
+async def test_connection(
+    host: str,
+    username: str,
+    password: str,
+    session: Optional[aiohttp.ClientSession] = None,
+    keep_html: bool = False,
+) -> InverterData:
+    """Test connection to the Deye inverter.
+    
+    Pass a session to reuse its kept-alive connection across calls;
+    without one a temporary session is created. The raw response is
+    only kept in the result when keep_html is set.
+    """
     url = f"http://{host}/status.html"
     data = InverterData()
     
@@ -190,48 +284,22 @@ async def test_connection(host: str, username: str, password: str) -> InverterDa
     
     try:
         auth = aiohttp.BasicAuth(username, password)
-        timeout = aiohttp.ClientTimeout(total=30, connect=10)
         
-        async with aiohttp.ClientSession() as session:
-            print(f"\n📡 Connecting to inverter...")
-            
-            async with session.get(url, auth=auth, timeout=timeout) as response:
-                print(f"📬 Response status: {response.status}")
-                
-                if response.status == 401:
-                    data.available = False
-                    data.error_message = "Authentication failed"
-                    print("\n❌ ERROR: Authentication failed!")
-                    print("   Check your username and password.")
-                    return data
-                
-                if response.status != 200:
-                    data.available = False
-                    data.error_message = f"HTTP error {response.status}"
-                    print(f"\n❌ ERROR: Unexpected HTTP status {response.status}")
-                    return data
-                
-                print("📥 Reading response data...")
-                html = await response.text()
-                
-                # Check if we got valid data
-                if "webdata_now_p" not in html:
-                    data.available = False
-                    data.error_message = "Invalid response format"
-                    print("\n⚠ WARNING: Could not find expected data in response!")
-                    print("   The page structure might be different.")
-                    print("\n--- First 2000 characters of response ---")
-                    print(html[:2000])
-                    print("--- End of preview ---\n")
-                    data.raw_html = html
-                    return data
-                
-                return parse_status_page(html)
+        # One asyncio-level deadline for the whole request instead of aiohttp's
+        # per-request timeout machinery (wait_for keeps Python 3.10 working)
+        if session is None:
+            async with create_session() as own_session:
+                return await asyncio.wait_for(
+                    fetch_status(own_session, url, auth, data, keep_html), REQUEST_TIMEOUT
+                )
+        return await asyncio.wait_for(
+            fetch_status(session, url, auth, data, keep_html), REQUEST_TIMEOUT
+        )
                 
     except asyncio.TimeoutError:
         data.available = False
         data.error_message = "Connection timeout"
-        print(f"\n⚠ TIMEOUT: Connection timeout after 10 seconds")
+        print(f"\n⚠ TIMEOUT: Connection timeout after {REQUEST_TIMEOUT} seconds")
         print("   This is NORMAL if the inverter is in night/sleep mode!")
         print("   The inverter turns off when there's no solar power.")
         return data
@@ -260,84 +328,87 @@ async def test_connection(host: str, username: str, password: str) -> InverterDa
 
 def print_results(data: InverterData):
     """Print the test results."""
-    print(f"\n{'='*60}")
-    print("📋 Results Summary")
-    print(f"{'='*60}")
+    # Collect the report and write it in one go
+    lines: list[str] = []
+    lines.append(f"\n{'='*60}")
+    lines.append("📋 Results Summary")
+    lines.append(f"{'='*60}")
     
     # Status
     if data.available:
-        print(f"\n🟢 Status: ONLINE")
+        lines.append(f"\n🟢 Status: ONLINE")
     else:
-        print(f"\n🔴 Status: OFFLINE")
+        lines.append(f"\n🔴 Status: OFFLINE")
         if data.error_message:
-            print(f"   Reason: {data.error_message}")
+            lines.append(f"   Reason: {data.error_message}")
     
     # Device info table
     if data.serial_number or data.firmware_version:
-        print(f"\n┌{'─'*44}┐")
-        print(f"│ {'DEVICE INFORMATION':<42} │")
-        print(f"├{'─'*44}┤")
+        lines.append(f"\n┌{HRULE}┐")
+        lines.append(f"│ {'DEVICE INFORMATION':<42} │")
+        lines.append(f"├{HRULE}┤")
         if data.serial_number:
-            print(f"│ {'Serial Number':<20} │ {data.serial_number:<19} │")
+            lines.append(f"│ {'Serial Number':<20} │ {data.serial_number:<19} │")
         if data.firmware_version:
-            print(f"│ {'Firmware':<20} │ {data.firmware_version:<19} │")
+            lines.append(f"│ {'Firmware':<20} │ {data.firmware_version:<19} │")
         if data.module_id:
-            print(f"│ {'Module ID':<20} │ {data.module_id:<19} │")
-        print(f"└{'─'*44}┘")
+            lines.append(f"│ {'Module ID':<20} │ {data.module_id:<19} │")
+        lines.append(f"└{HRULE}┘")
     
     # WiFi info table
     if data.wifi_ssid:
-        print(f"\n┌{'─'*44}┐")
-        print(f"│ {'WIFI INFORMATION':<42} │")
-        print(f"├{'─'*44}┤")
-        print(f"│ {'Network (SSID)':<20} │ {(data.wifi_ssid or 'N/A'):<19} │")
-        print(f"│ {'Signal Strength':<20} │ {(data.wifi_signal or 'N/A'):<19} │")
+        lines.append(f"\n┌{HRULE}┐")
+        lines.append(f"│ {'WIFI INFORMATION':<42} │")
+        lines.append(f"├{HRULE}┤")
+        lines.append(f"│ {'Network (SSID)':<20} │ {(data.wifi_ssid or 'N/A'):<19} │")
+        lines.append(f"│ {'Signal Strength':<20} │ {(data.wifi_signal or 'N/A'):<19} │")
         if data.wifi_ip:
-            print(f"│ {'IP Address':<20} │ {data.wifi_ip:<19} │")
+            lines.append(f"│ {'IP Address':<20} │ {data.wifi_ip:<19} │")
         if data.wifi_mac:
-            print(f"│ {'MAC Address':<20} │ {data.wifi_mac:<19} │")
-        print(f"└{'─'*44}┘")
+            lines.append(f"│ {'MAC Address':<20} │ {data.wifi_mac:<19} │")
+        lines.append(f"└{HRULE}┘")
     
     # Power data table
-    print(f"\n┌{'─'*44}┐")
-    print(f"│ {'POWER DATA':<42} │")
-    print(f"├{'─'*44}┤")
+    lines.append(f"\n┌{HRULE}┐")
+    lines.append(f"│ {'POWER DATA':<42} │")
+    lines.append(f"├{HRULE}┤")
     
     if data.available:
         power_str = f"{data.current_power:.1f} W" if data.current_power is not None else "N/A"
         today_str = f"{data.today_energy:.2f} kWh" if data.today_energy is not None else "N/A"
         total_str = f"{data.total_energy:.2f} kWh" if data.total_energy is not None else "N/A"
         
-        print(f"│ {'Current Power':<20} │ {power_str:>19} │")
-        print(f"│ {'Energy Today':<20} │ {today_str:>19} │")
-        print(f"│ {'Energy Total':<20} │ {total_str:>19} │")
+        lines.append(f"│ {'Current Power':<20} │ {power_str:>19} │")
+        lines.append(f"│ {'Energy Today':<20} │ {today_str:>19} │")
+        lines.append(f"│ {'Energy Total':<20} │ {total_str:>19} │")
     else:
-        print(f"│ {'Current Power':<20} │ {'UNAVAILABLE':>19} │")
-        print(f"│ {'Energy Today':<20} │ {'UNAVAILABLE':>19} │")
-        print(f"│ {'Energy Total':<20} │ {'UNAVAILABLE':>19} │")
+        lines.append(f"│ {'Current Power':<20} │ {'UNAVAILABLE':>19} │")
+        lines.append(f"│ {'Energy Today':<20} │ {'UNAVAILABLE':>19} │")
+        lines.append(f"│ {'Energy Total':<20} │ {'UNAVAILABLE':>19} │")
     
-    print(f"└{'─'*44}┘")
+    lines.append(f"└{HRULE}┘")
     
     # Final status
-    print(f"\n{'='*60}")
+    lines.append(f"\n{'='*60}")
     if data.available:
-        print("✅ Test SUCCESSFUL - All systems operational!")
-        print("\n📦 Installation in Home Assistant:")
-        print("   1. Copy custom_components/deye_sun to your HA config folder")
-        print("   2. Restart Home Assistant")
-        print("   3. Add the integration via Settings -> Integrations")
-        print("   4. Search for 'Deye SUN Inverter' and configure")
-        return True
+        lines.append("✅ Test SUCCESSFUL - All systems operational!")
+        lines.append("\n📦 Installation in Home Assistant:")
+        lines.append("   1. Copy custom_components/deye_sun to your HA config folder")
+        lines.append("   2. Restart Home Assistant")
+        lines.append("   3. Add the integration via Settings -> Integrations")
+        lines.append("   4. Search for 'Deye SUN Inverter' and configure")
     else:
-        print("⚠️  Test completed - Inverter is OFFLINE")
-        print("\n   This is NORMAL behavior at night or without sunlight!")
-        print("   The Deye inverter turns off when there's no power to save energy.")
-        print("\n   The Home Assistant integration handles this gracefully:")
-        print("   • Sensors will show 'unavailable' when offline")
-        print("   • Data will automatically recover when the sun rises")
-        print("   • No errors will be logged (only debug messages)")
-        print("\n   You can still install the integration - it will work!")
-        return True  # Still success, just offline
+        lines.append("⚠️  Test completed - Inverter is OFFLINE")
+        lines.append("\n   This is NORMAL behavior at night or without sunlight!")
+        lines.append("   The Deye inverter turns off when there's no power to save energy.")
+        lines.append("\n   The Home Assistant integration handles this gracefully:")
+        lines.append("   • Sensors will show 'unavailable' when offline")
+        lines.append("   • Data will automatically recover when the sun rises")
+        lines.append("   • No errors will be logged (only debug messages)")
+        lines.append("\n   You can still install the integration - it will work!")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    return True  # Offline is still a success
 
 
 async def main():
@@ -350,6 +421,7 @@ Examples:
   python test_connection.py --host 192.168.1.100
   python test_connection.py -H 192.168.1.100 -u admin -p mypassword
   python test_connection.py --host 192.168.1.100 --save-html
+  python test_connection.py --host 192.168.1.100 --verbose
 
 IMPORTANT: Assign a static IP address to your inverter!
 The inverter may be offline at night - this is normal behavior.
@@ -375,14 +447,27 @@ The inverter may be offline at night - this is normal behavior.
         action="store_true",
         help="Save the raw HTML response to a file for debugging"
     )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Log every parsed variable"
+    )
     
     args = parser.parse_args()
     
-    data = await test_connection(args.host, args.user, args.password)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(levelname)s: %(message)s",
+    )
+    
+    async with create_session() as session:
+        data = await test_connection(
+            args.host, args.user, args.password, session, keep_html=args.save_html
+        )
     
-    if data.raw_html and args.save_html:
+    if data.raw_html:
         filename = f"deye_response_{args.host.replace('.', '_')}.html"
-        with open(filename, "w", encoding="utf-8") as f:
+        with open(filename, "wb") as f:
             f.write(data.raw_html)
         print(f"\n📄 Raw HTML saved to: {filename}")
     
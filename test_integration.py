@@ -4,196 +4,248 @@ Local test script to validate the Deye SUN integration code.
 This checks for syntax errors and basic import issues without Home Assistant.
 """
 
-import ast
+import os
+import re
 import sys
 import json
 from pathlib import Path
+from typing import Any
+
+# orjson is optional; its JSONDecodeError subclasses json.JSONDecodeError,
+# so the error handling below works with either parser
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 INTEGRATION_PATH = Path("custom_components/deye_sun_microinverter")
 
-def check_python_syntax(file_path: Path) -> tuple[bool, str]:
-    """Check Python file for syntax errors."""
+def check_python_syntax(file_path: str) -> tuple[bool, str, bytes | None]:
+    """Check Python file for syntax errors.
+    
+    Also returns the source bytes (None if unreadable) so the code
+    analysis can reuse them without opening the file again.
+    """
+    source = None
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            source = f.read()
-        ast.parse(source)
-        return True, "OK"
+        # compile() takes the raw bytes and does the decoding itself
+        source = Path(file_path).read_bytes()
+        # Only the verdict matters, so skip building Python-level AST nodes
+        compile(source, os.path.basename(file_path), "exec", dont_inherit=True)
+        return True, "OK", source
     except SyntaxError as e:
-        return False, f"Line {e.lineno}: {e.msg}"
+        return False, f"Line {e.lineno}: {e.msg}", source
     except Exception as e:
-        return False, str(e)
+        return False, str(e), source
 
-def check_json_syntax(file_path: Path) -> tuple[bool, str]:
-    """Check JSON file for syntax errors."""
+def check_json_syntax(file_path: str) -> tuple[bool, str, Any]:
+    """Check JSON file for syntax errors.
+    
+    Also returns the parsed document (None on failure) so the later
+    checks can use it without parsing the file again.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            json.load(f)
-        return True, "OK"
+        # Both parsers take the raw bytes directly
+        obj = json_loads(Path(file_path).read_bytes())
+        return True, "OK", obj
     except json.JSONDecodeError as e:
-        return False, f"Line {e.lineno}: {e.msg}"
+        return False, f"Line {e.lineno}: {e.msg}", None
     except Exception as e:
-        return False, str(e)
+        return False, str(e), None
 
-def check_manifest(file_path: Path) -> tuple[bool, str]:
-    """Check manifest.json for required fields."""
-    required_fields = ["domain", "name", "version", "config_flow"]
+# Fields every manifest.json must have
+REQUIRED_MANIFEST_FIELDS = frozenset({"domain", "name", "version", "config_flow"})
+
+def check_manifest(manifest: dict) -> tuple[bool, str]:
+    """Check the parsed manifest.json for required fields."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
-        
-        missing = [f for f in required_fields if f not in manifest]
+        missing = REQUIRED_MANIFEST_FIELDS.difference(manifest)
         if missing:
-            return False, f"Missing required fields: {missing}"
+            return False, f"Missing required fields: {sorted(missing)}"
         
         return True, f"Domain: {manifest['domain']}, Version: {manifest['version']}"
     except Exception as e:
         return False, str(e)
 
-def check_translations_match(strings_path: Path, translations_path: Path) -> tuple[bool, str]:
-    """Check that translations have the same keys as strings.json."""
+def get_keys(d: dict) -> set[str]:
+    """Return the dotted keys of all leaves of a nested dict."""
+    # Explicit stack, dotted keys joined only at the leaves; the JSON
+    # parsers only produce plain dicts, so an exact type check is enough
+    keys = set()
+    stack = [(d, ())]
+    dict_type = dict
+    while stack:
+        node, prefix = stack.pop()
+        for k, v in node.items():
+            path = prefix + (k,)
+            if type(v) is dict_type:
+                stack.append((v, path))
+            else:
+                keys.add(".".join(path))
+    return keys
+
+def check_translations_match(strings: dict, translations: dict[str, dict]) -> tuple[bool, str]:
+    """Check that the parsed translations have the same keys as strings.json."""
     try:
-        with open(strings_path, 'r', encoding='utf-8') as f:
-            strings = json.load(f)
-        
-        def get_keys(d, prefix=""):
-            keys = set()
-            for k, v in d.items():
-                full_key = f"{prefix}.{k}" if prefix else k
-                if isinstance(v, dict):
-                    keys.update(get_keys(v, full_key))
-                else:
-                    keys.add(full_key)
-            return keys
-        
         strings_keys = get_keys(strings)
         
-        for trans_file in translations_path.glob("*.json"):
-            with open(trans_file, 'r', encoding='utf-8') as f:
-                trans = json.load(f)
-            trans_keys = get_keys(trans)
-            
-            missing_in_trans = strings_keys - trans_keys
-            extra_in_trans = trans_keys - strings_keys
+        for trans_name, trans in translations.items():
+            missing_in_trans = strings_keys - get_keys(trans)
             
             if missing_in_trans:
-                return False, f"{trans_file.name}: Missing keys: {missing_in_trans}"
+                return False, f"{trans_name}: Missing keys: {missing_in_trans}"
         
         return True, "All translations match strings.json"
     except Exception as e:
         return False, str(e)
 
+# Everything the code analysis looks for, found in a single pass per file
+CODE_TOKENS_RE = re.compile(
+    rb"OptionsFlow|async_get_options_flow|domain=DOMAIN|async_setup_entry|async_unload_entry"
+)
+
+def find_code_tokens(source: bytes) -> set[bytes]:
+    """Return which of the analysed tokens occur in a source file."""
+    return {m.group() for m in CODE_TOKENS_RE.finditer(source)}
+
+def list_files(directory: Path) -> tuple[list[os.DirEntry], list[os.DirEntry]]:
+    """Return the .py and .json files of a directory from one scandir pass."""
+    py_files, json_files = [], []
+    if not directory.exists():
+        return py_files, json_files
+    with os.scandir(directory) as it:
+        for entry in it:
+            # DirEntry caches the file type, so this needs no extra stat;
+            # hidden files are skipped like glob("*") did
+            if entry.name.startswith(".") or not entry.is_file(follow_symlinks=False):
+                continue
+            if entry.name.endswith(".py"):
+                py_files.append(entry)
+            elif entry.name.endswith(".json"):
+                json_files.append(entry)
+    return py_files, json_files
+
 def main():
-    print("=" * 60)
-    print("🔍 Deye SUN Integration Validation")
-    print("=" * 60)
+    # Collect the report and write it in one go at the end
+    out: list[str] = []
+    out.append("=" * 60)
+    out.append("🔍 Deye SUN Integration Validation")
+    out.append("=" * 60)
     
     errors = []
     warnings = []
     
-    # Check Python files
-    print("\n📄 Python Files:")
-    py_files = list(INTEGRATION_PATH.glob("*.py"))
+    py_files, json_files = list_files(INTEGRATION_PATH)
+    trans_path = INTEGRATION_PATH / "translations"
+    _, trans_files = list_files(trans_path)
+    
+    # Check Python files, keeping their source for the code analysis
+    out.append("\n📄 Python Files:")
+    sources: dict[str, bytes] = {}
     for py_file in py_files:
-        success, msg = check_python_syntax(py_file)
+        success, msg, source = check_python_syntax(py_file.path)
+        if source is not None:
+            sources[py_file.name] = source
         status = "✅" if success else "❌"
-        print(f"   {status} {py_file.name}: {msg}")
+        out.append(f"   {status} {py_file.name}: {msg}")
         if not success:
             errors.append(f"{py_file.name}: {msg}")
     
-    # Check JSON files
-    print("\n📄 JSON Files:")
-    json_files = list(INTEGRATION_PATH.glob("*.json"))
+    # Check JSON files, keeping the parsed documents for the checks below
+    out.append("\n📄 JSON Files:")
+    parsed: dict[str, Any] = {}
     for json_file in json_files:
-        success, msg = check_json_syntax(json_file)
+        success, msg, obj = check_json_syntax(json_file.path)
+        if success:
+            parsed[json_file.name] = obj
         status = "✅" if success else "❌"
-        print(f"   {status} {json_file.name}: {msg}")
+        out.append(f"   {status} {json_file.name}: {msg}")
         if not success:
             errors.append(f"{json_file.name}: {msg}")
     
     # Check translation files
-    trans_path = INTEGRATION_PATH / "translations"
+    translations: dict[str, Any] = {}
     if trans_path.exists():
-        print("\n📄 Translation Files:")
-        for trans_file in trans_path.glob("*.json"):
-            success, msg = check_json_syntax(trans_file)
+        out.append("\n📄 Translation Files:")
+        for trans_file in trans_files:
+            success, msg, obj = check_json_syntax(trans_file.path)
+            if success:
+                translations[trans_file.name] = obj
             status = "✅" if success else "❌"
-            print(f"   {status} {trans_file.name}: {msg}")
+            out.append(f"   {status} {trans_file.name}: {msg}")
             if not success:
                 errors.append(f"translations/{trans_file.name}: {msg}")
     
     # Check manifest
-    print("\n📦 Manifest Check:")
-    manifest_path = INTEGRATION_PATH / "manifest.json"
-    if manifest_path.exists():
-        success, msg = check_manifest(manifest_path)
+    out.append("\n📦 Manifest Check:")
+    if "manifest.json" in parsed:
+        success, msg = check_manifest(parsed["manifest.json"])
         status = "✅" if success else "❌"
-        print(f"   {status} {msg}")
+        out.append(f"   {status} {msg}")
         if not success:
             errors.append(f"manifest.json: {msg}")
+    elif (INTEGRATION_PATH / "manifest.json").exists():
+        # Already reported as a JSON error above
+        out.append("   ❌ Skipped, manifest.json is not valid JSON")
     
     # Check translation completeness
-    print("\n🌐 Translation Completeness:")
-    strings_path = INTEGRATION_PATH / "strings.json"
-    if strings_path.exists() and trans_path.exists():
-        success, msg = check_translations_match(strings_path, trans_path)
+    out.append("\n🌐 Translation Completeness:")
+    if "strings.json" in parsed and trans_path.exists():
+        success, msg = check_translations_match(parsed["strings.json"], translations)
         status = "✅" if success else "⚠️"
-        print(f"   {status} {msg}")
+        out.append(f"   {status} {msg}")
         if not success:
             warnings.append(msg)
     
     # Check for common issues in code
-    print("\n🔬 Code Analysis:")
+    out.append("\n🔬 Code Analysis:")
     
     # Check config_flow.py for OptionsFlow
-    config_flow = INTEGRATION_PATH / "config_flow.py"
-    if config_flow.exists():
-        with open(config_flow, 'r', encoding='utf-8') as f:
-            content = f.read()
+    if "config_flow.py" in sources:
+        tokens = find_code_tokens(sources["config_flow.py"])
         
-        has_options_flow = "OptionsFlow" in content or "async_get_options_flow" in content
+        has_options_flow = b"OptionsFlow" in tokens or b"async_get_options_flow" in tokens
         status = "✅" if has_options_flow else "ℹ️"
-        print(f"   {status} Options Flow: {'Implemented' if has_options_flow else 'Not implemented'}")
+        out.append(f"   {status} Options Flow: {'Implemented' if has_options_flow else 'Not implemented'}")
         
-        has_domain = "domain=DOMAIN" in content
+        has_domain = b"domain=DOMAIN" in tokens
         status = "✅" if has_domain else "❌"
-        print(f"   {status} ConfigFlow domain binding: {'Found' if has_domain else 'Missing'}")
+        out.append(f"   {status} ConfigFlow domain binding: {'Found' if has_domain else 'Missing'}")
         if not has_domain:
             errors.append("config_flow.py: Missing domain=DOMAIN in ConfigFlow class")
     
     # Check __init__.py
-    init_file = INTEGRATION_PATH / "__init__.py"
-    if init_file.exists():
-        with open(init_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+    if "__init__.py" in sources:
+        tokens = find_code_tokens(sources["__init__.py"])
         
-        has_setup_entry = "async_setup_entry" in content
-        has_unload_entry = "async_unload_entry" in content
+        has_setup_entry = b"async_setup_entry" in tokens
+        has_unload_entry = b"async_unload_entry" in tokens
         
         status = "✅" if has_setup_entry else "❌"
-        print(f"   {status} async_setup_entry: {'Found' if has_setup_entry else 'Missing'}")
+        out.append(f"   {status} async_setup_entry: {'Found' if has_setup_entry else 'Missing'}")
         if not has_setup_entry:
             errors.append("__init__.py: Missing async_setup_entry")
         
         status = "✅" if has_unload_entry else "❌"
-        print(f"   {status} async_unload_entry: {'Found' if has_unload_entry else 'Missing'}")
+        out.append(f"   {status} async_unload_entry: {'Found' if has_unload_entry else 'Missing'}")
         if not has_unload_entry:
             errors.append("__init__.py: Missing async_unload_entry")
     
     # Summary
-    print("\n" + "=" * 60)
+    out.append("\n" + "=" * 60)
     if errors:
-        print(f"❌ VALIDATION FAILED - {len(errors)} error(s) found:")
+        out.append(f"❌ VALIDATION FAILED - {len(errors)} error(s) found:")
         for err in errors:
-            print(f"   • {err}")
-        return 1
+            out.append(f"   • {err}")
     elif warnings:
-        print(f"⚠️  VALIDATION PASSED with {len(warnings)} warning(s):")
+        out.append(f"⚠️  VALIDATION PASSED with {len(warnings)} warning(s):")
         for warn in warnings:
-            print(f"   • {warn}")
-        return 0
+            out.append(f"   • {warn}")
     else:
-        print("✅ VALIDATION PASSED - Integration is ready!")
-        return 0
+        out.append("✅ VALIDATION PASSED - Integration is ready!")
+    
+    sys.stdout.write("\n".join(out) + "\n")
+    return 1 if errors else 0
 
 if __name__ == "__main__":
     sys.exit(main())